@@ -0,0 +1,36 @@
+import pandas as pd
+
+# Author Greg Campbell - see MIT License in repository
+# One-shot conversion of the movie database from CSV to Parquet, so the app
+# can skip CSV parsing and load typed columns directly.
+
+# -----------------------------
+# USAGE:
+# -----------------------------
+## Re-run whenever movie_database.csv changes (e.g. after database_setup.ipynb)
+## In terminal:
+### python convert_csv_to_parquet.py
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+CSV_FILE = "movie_database.csv"
+PARQUET_FILE = "movie_database.parquet"
+
+# Read actor columns as text so all-empty ones (e.g. Actor10) stay strings
+# instead of being inferred as float
+header = pd.read_csv(CSV_FILE, nrows=0).columns
+actor_cols = [col for col in header if col.startswith("Actor")]
+df = pd.read_csv(CSV_FILE, dtype={col: "string" for col in actor_cols})
+
+# Convert Year to numeric
+df["Year"] = pd.to_numeric(df["Year"], errors="coerce")
+
+# Convert rating to float, coerce errors to NaN
+df['imdbRating'] = pd.to_numeric(df['imdbRating'], errors='coerce')
+
+# Convert runtime to minutes in one regex pass ("109 min" -> 109, "N/A" -> NA)
+df['Runtime'] = df['Runtime'].astype("string").str.extract(r"(\d+)", expand=False).astype("Int64")
+
+df.to_parquet(PARQUET_FILE, index=False)
+print(f"Wrote {len(df)} movies to {PARQUET_FILE}")
@@ -1,6 +1,10 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
 import math
+import re
+from functools import reduce
 
 # Author Greg Campbell - see MIT License in repository
 # Written with assistance from ChatGPT (GPT-5.2)
@@ -12,20 +16,22 @@ import math
 # 2026-02-02: Updated home database, fixed mobile layout
 # 2026-02-03: Added runtime filter
 # 2026-02-04: Added franchise detection and filters (HP, SW, Bond), can sort after random
+# 2026-10-15: Cached data prep, vectorized filters, paginated poster grid
 
 # -----------------------------
 # USAGE:
 # -----------------------------
 ## In terminal:
 ## Installs if needed:
-### pip install streamlit pandas 
+### pip install streamlit pandas pyarrow
 ## Run app:
 ### streamlit run movie_app.py
 
 # -----------------------------
 # CONFIG
 # -----------------------------
-CSV_FILE = "movie_database.csv"
+PARQUET_FILE = "movie_database.parquet"  # built by convert_csv_to_parquet.py
+PAGE_SIZE = 50  # max posters rendered per rerun
 
 st.set_page_config(layout="wide")
 st.title("🎬 Movie Database")
@@ -43,6 +49,21 @@ st.markdown("""
     width: 100%;
 }
 
+/* Poster grid (replaces per-row st.columns) */
+.movie-grid {
+    display: grid;
+    grid-template-columns: repeat(5, 1fr);
+    gap: 1rem;
+    margin-bottom: 1rem;
+}
+
+/* Fewer columns on narrow (mobile) screens */
+@media (max-width: 640px) {
+    .movie-grid {
+        grid-template-columns: repeat(2, 1fr);
+    }
+}
+
 /* Card styling */
 .movie-card {
     width: 100%;
@@ -95,62 +116,95 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # -----------------------------
-# LOAD DATA
-# -----------------------------
-@st.cache_data
-def load_data():
-    df = pd.read_csv(CSV_FILE)
-    return df
-
-df = load_data()
-
-# -----------------------------
-# CLEAN / PREP DATA
+# LOAD + PREP DATA
 # -----------------------------
-
-# Convert Year to numeric
-df["Year"] = pd.to_numeric(df["Year"], errors="coerce")
-
-# Combine Actor1–Actor10 if they exist
-actor_cols = [col for col in df.columns if col.startswith("Actor")]
-
-# Convert rating to float, coerce errors to NaN
-df['imdbRating'] = pd.to_numeric(df['imdbRating'], errors='coerce')
-
-# Convert runtime to float, coerce errors to NaN
-# remove ' min' if it exists, then convert
-df['Runtime'] = df['Runtime'].astype(str).str.replace(' min', '', regex=False)
-df['Runtime'] = pd.to_numeric(df['Runtime'], errors='coerce')
-
-if actor_cols:
-    df["AllActors"] = df[actor_cols].fillna("").agg(", ".join, axis=1)
-else:
-    df["AllActors"] = df.get("Actors", "")
-
-# refine titles for sorting
-def normalize_title(title):
-    if not isinstance(title, str):
-        return ""
-    title = title.strip()
-    if title.lower().startswith("the "):
-        return title[4:]
-    return title
-
-# Franchise detection keywords
-def detect_franchise(plot, keywords):
-    if not isinstance(plot, str):
-        return False
-    plot = plot.lower()
-    return any(keyword in plot for keyword in keywords)
-
 franchises = {
     "Harry Potter": ["harry potter", "hogwarts", "voldemort"],
     "Star Wars": ["star wars", "jedi", "sith", "skywalker", "death star"],
     "James Bond": ["james bond", "007", "mi6"]
 }
 
-for name, keywords in franchises.items():
-    df[name] = df["Plot"].apply(lambda x: detect_franchise(x, keywords))
+# Map each comma-separated value to the row positions it appears in
+def build_index(series):
+    index = {}
+    for i, values in enumerate(series.fillna("")):
+        for v in values.split(","):
+            v = v.strip()
+            if v:
+                index.setdefault(v, []).append(i)
+    return {k: np.array(v) for k, v in index.items()}
+
+# Cached so cleaning/prep runs once, not on every Streamlit rerun
+@st.cache_data
+def prep_data():
+    # Year/imdbRating/Runtime are already numeric (see convert_csv_to_parquet.py)
+    df = pd.read_parquet(PARQUET_FILE, dtype_backend="pyarrow")
+
+    # Combine Actor1–Actor10 if they exist
+    actor_cols = [col for col in df.columns if col.startswith("Actor")]
+
+    if actor_cols:
+        parts = [df[c].fillna("") for c in actor_cols]
+        df["AllActors"] = reduce(lambda a, b: a + ", " + b, parts)
+    else:
+        df["AllActors"] = df.get("Actors", "")
+
+    # Franchise detection (vectorized, one regex scan per franchise)
+    plot_series = df["Plot"].fillna("")
+    for name, keywords in franchises.items():
+        pattern = "|".join(map(re.escape, keywords))
+        df[name] = plot_series.str.contains(pattern, case=False, regex=True)
+
+    # Display-ready year string (blank if missing)
+    df["YearStr"] = df["Year"].astype("Int64").astype(pd.ArrowDtype(pa.string())).fillna("")
+
+    # Refine titles for sorting (drop leading "The ")
+    t = df["Title"].fillna("").str.strip()
+    df["SortTitle"] = t.str[4:].where(t.str.lower().str.startswith("the "), t)
+
+    # Shorten long titles for the cards
+    t = df["Title"].fillna("")
+    df["ShortTitle"] = (t.str[:18] + "..." + t.str[-6:]).where(t.str.len() > 25, t)
+
+    # Full card HTML per movie, kept on one line so markdown doesn't treat
+    # it as a code block
+    has_poster = df["Poster"].notna() & (df["Poster"] != "N/A")
+    poster_html = np.where(
+        has_poster,
+        '<img src="' + df["Poster"].fillna("") + '" loading="lazy" '
+        'decoding="async" width="200" height="300">',
+        ""
+    )
+    df["CardHtml"] = (
+        '<a href="https://www.imdb.com/title/' + df["imdbID"].fillna("")
+        + '/" target="_blank" class="movie-link"><div class="movie-card">'
+        + poster_html
+        + '<div class="movie-title">' + df["ShortTitle"] + '</div>'
+        + '<div class="movie-year">' + df["YearStr"] + '</div>'
+        + '</div></a>'
+    )
+
+    # Text columns are already Arrow strings from read_parquet; use nullable
+    # booleans for the franchise masks
+    for name in franchises:
+        df[name] = df[name].astype("boolean")
+
+    # Genre/actor -> row positions, so filtering is a lookup rather than a scan
+    genre_index = build_index(df["Genre"])
+    actor_index = build_index(df["AllActors"])
+
+    # Sidebar options come straight from the index keys
+    all_genres = sorted(genre_index)
+    all_actors = sorted(actor_index)
+
+    year_bounds = (int(df["Year"].min()), int(df["Year"].max()))
+    runtime_bounds = (int(df["Runtime"].min()), int(df["Runtime"].max()))
+
+    return (df, all_genres, all_actors, genre_index, actor_index,
+            year_bounds, runtime_bounds)
+
+(df, all_genres, all_actors, genre_index, actor_index,
+ year_bounds, runtime_bounds) = prep_data()
 
 # -----------------------------
 # Set up Session State
@@ -170,17 +224,9 @@ st.sidebar.header("Filter Movies")
 search_query = st.sidebar.text_input("Search Title")
 
 # Genre filter
-all_genres = sorted(
-    set(g.strip() for genres in df["Genre"].dropna()
-        for g in genres.split(","))
-)
 selected_genres = st.sidebar.multiselect("Genre", all_genres)
 
 # Actor filter
-all_actors = sorted(
-    set(a.strip() for actors in df["AllActors"].dropna()
-        for a in actors.split(",") if a.strip())
-)
 selected_actors = st.sidebar.multiselect("Actor", all_actors)
 
 # Sort option
@@ -196,13 +242,11 @@ sort_option = st.sidebar.selectbox(
 )
 
 # Year filter
-min_year = int(df["Year"].min())
-max_year = int(df["Year"].max())
+min_year, max_year = year_bounds
 year_range = st.sidebar.slider("Year Range", min_year, max_year, (min_year, max_year))
 
 # Runtime filter
-min_runtime = int(df["Runtime"].min())
-max_runtime = int(df["Runtime"].max())
+min_runtime, max_runtime = runtime_bounds
 runtime_range = st.sidebar.slider("Runtime Range (minutes)", min_runtime, max_runtime, (min_runtime, max_runtime))
 
 # Random button
@@ -229,51 +273,51 @@ include_bond = st.sidebar.checkbox("James Bond", value=True)
 # -----------------------------
 # APPLY FILTERS
 # -----------------------------
-filtered_df = df.copy()
+# Cheap predicates first, combined into one mask over the full table
+mask = np.ones(len(df), dtype=bool)
 
-# Title search filter (case-insensitive substring match)
-if search_query:
-    filtered_df = filtered_df[
-        filtered_df["Title"].str.contains(search_query, case=False, na=False)
-    ]
+# Franchise filters
+if not include_hp:
+    mask &= ~df["Harry Potter"].to_numpy(dtype=bool)
+if not include_sw:
+    mask &= ~df["Star Wars"].to_numpy(dtype=bool)
+if not include_bond:
+    mask &= ~df["James Bond"].to_numpy(dtype=bool)
 
-# Genre filter
+# Year filter
+years = df["Year"].to_numpy(dtype=float, na_value=np.nan)
+mask &= (years >= year_range[0]) & (years <= year_range[1])
+
+# Runtime filter
+runtimes = df["Runtime"].to_numpy(dtype=float, na_value=np.nan)
+mask &= (runtimes >= runtime_range[0]) & (runtimes <= runtime_range[1])
+
+# Genre filter (whole comma-separated values, e.g. "Music" doesn't match "Musical")
 if selected_genres:
-    filtered_df = filtered_df[
-        filtered_df["Genre"].apply(
-            lambda x: any(g in x for g in selected_genres) if pd.notna(x) else False
-        )
-    ]
+    genre_sel = np.zeros(len(df), dtype=bool)
+    for g in selected_genres:
+        genre_sel[genre_index[g]] = True
+    mask &= genre_sel
 
-# Actor filter
+# Actor filter (whole names)
 if selected_actors:
-    filtered_df = filtered_df[
-        filtered_df["AllActors"].apply(
-            lambda x: any(a in x for a in selected_actors) if pd.notna(x) else False
-        )
-    ]
+    actor_sel = np.zeros(len(df), dtype=bool)
+    for a in selected_actors:
+        actor_sel[actor_index[a]] = True
+    mask &= actor_sel
 
-# Year filter
-filtered_df = filtered_df[
-    (filtered_df["Year"] >= year_range[0]) &
-    (filtered_df["Year"] <= year_range[1])
-]
-
-# Runtime filter
-filtered_df = filtered_df[
-    (filtered_df["Runtime"] >= runtime_range[0]) &
-    (filtered_df["Runtime"] <= runtime_range[1])
-]
+# Title search filter (case-insensitive substring match), only scanning
+# rows that survived the cheap predicates
+if search_query:
+    candidates = np.flatnonzero(mask)
+    mask[candidates] = (
+        df["Title"].iloc[candidates]
+        .str.contains(search_query, case=False, na=False)
+        .to_numpy(dtype=bool)
+    )
 
-# for franchise in selected_franchise:
-#     filtered_df = filtered_df[~filtered_df[franchise]]
-# Franchise filters
-if not include_hp:
-    filtered_df = filtered_df[~filtered_df["Harry Potter"]]
-if not include_sw:
-    filtered_df = filtered_df[~filtered_df["Star Wars"]]
-if not include_bond:
-    filtered_df = filtered_df[~filtered_df["James Bond"]]
+# Index the table once, no intermediate copies
+filtered_df = df[mask]
 
 # ----------------------------
 # Filter check
@@ -295,7 +339,10 @@ if "random_selection" not in st.session_state:
 # Pick random
 if pick_random and len(filtered_df) > 0:
     sample_size = min(num_random, len(filtered_df))
-    st.session_state.random_selection = filtered_df.sample(n=sample_size)
+    # Store row labels only; the rows are looked up from df when displayed
+    st.session_state.random_selection = np.random.default_rng().choice(
+        filtered_df.index.to_numpy(), size=sample_size, replace=False
+    )
     st.session_state.random_mode = True
 
 # Clear random
@@ -305,7 +352,7 @@ if clear_random:
 
 # If random button clicked, sample from filtered set
 if st.session_state.random_mode and st.session_state.random_selection is not None:
-    display_df = st.session_state.random_selection
+    display_df = df.loc[st.session_state.random_selection]
     st.markdown("### 🎲 Random Mode Active")
 else:
     display_df = filtered_df
@@ -315,9 +362,7 @@ else:
 # -----------------------------
 # Sort
 if sort_option == "Title":
-    display_df["sort_title"] = display_df["Title"].apply(normalize_title)
-    display_df = display_df.sort_values("sort_title")
-    display_df = display_df.drop(columns=["sort_title"])
+    display_df = display_df.sort_values("SortTitle")
 elif sort_option == "Year":
     display_df = display_df.sort_values("Year")
 elif sort_option == "IMDB Rating":
@@ -325,50 +370,25 @@ elif sort_option == "IMDB Rating":
 elif sort_option == "Runtime":
     display_df = display_df.sort_values("Runtime")
 
-
 # -----------------------------
 # DISPLAY POSTER GRID
 # -----------------------------
 st.write(f"### Choosing from {len(filtered_df)} movies")
 
-# if st.query_params.get("mobile") == "1":
-#     num_cols = 1
-# else:
-num_cols = 5
-cols = st.columns(num_cols)
-
-num_cols = 5
-
-# Display in grid by rows (scales if unable to get up to num_cols)
-for i in range(0, len(display_df), num_cols):
-    row_slice = display_df.iloc[i:i+num_cols]
-    cols = st.columns(num_cols)
-
-    for col, (_, row) in zip(cols, row_slice.iterrows()):
-        with col:
-            imdb_id = row.get("imdbID", "")
-            imdb_url = f"https://www.imdb.com/title/{imdb_id}/"
-
-            # Shorten title if too long
-            if len(row['Title']) > 25:
-                title = f"{row['Title'][:18]}...{row['Title'][-6:]}"
-            else:
-                title = row['Title']
-
-            # Poster HTML
-            poster_html = ""
-            if pd.notna(row["Poster"]) and row["Poster"] != "N/A":
-                poster_html = f'<img src="{row["Poster"]}">'
-
-            # Full card HTML in ONE markdown block
-            card_html = f"""
-            <a href="{imdb_url}" target="_blank" class="movie-link">
-                <div class="movie-card">
-                    {poster_html}
-                    <div class="movie-title">{title}</div>
-                    <div class="movie-year">{int(row['Year']) if pd.notna(row['Year']) else ''}</div>
-                </div>
-            </a>
-            """
-
-            st.markdown(card_html, unsafe_allow_html=True)
\ No newline at end of file
+# Pagination: only render the visible page of posters
+num_pages = max(1, math.ceil(len(display_df) / PAGE_SIZE))
+page = 1
+if num_pages > 1:
+    page = st.number_input("Page", min_value=1, max_value=num_pages, value=1)
+
+start = (page - 1) * PAGE_SIZE
+end = min(page * PAGE_SIZE, len(display_df))
+if len(display_df) > 0:
+    st.caption(f"Showing {start + 1}–{end} of {len(display_df)} (page {page} of {num_pages})")
+display_df = display_df.iloc[start:end]
+
+# Whole grid in one markdown call; column count lives in the .movie-grid CSS
+st.markdown(
+    '<div class="movie-grid">' + "".join(display_df["CardHtml"]) + '</div>',
+    unsafe_allow_html=True
+)